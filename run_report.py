@@ -0,0 +1,41 @@
+import argparse
+import sys
+import time
+from src.report_exporter import DashboardReportExporter, SUPPORTED_FORMATS
+
+# --- CONFIGURATION ---
+INPUT_FILE = "output/eu_market_analysis_final.csv"
+REPORT_DIR = "output/reports"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Batch export dashboard views to static reports.")
+    parser.add_argument("--years", type=int, nargs="+", help="Years to export (default: all)")
+    parser.add_argument("--sectors", nargs="+", help="Sector names to export (default: all)")
+    parser.add_argument("--formats", nargs="+", default=["html"], choices=SUPPORTED_FORMATS,
+                        help="Output formats (default: html; png/pdf need kaleido + Chrome)")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--output-dir", default=REPORT_DIR, help=f"Report directory (default: {REPORT_DIR})")
+    parser.add_argument("--force", action="store_true", help="Re-render views even if their data is unchanged")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    exporter = DashboardReportExporter(INPUT_FILE, args.output_dir, args.formats, args.workers)
+
+    print(f"🖨️  Exporting dashboard views from {INPUT_FILE} to {args.output_dir}")
+    start = time.time()
+
+    try:
+        rendered, skipped, failed = exporter.export(args.years, args.sectors, args.force)
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"\n✅ Report Export Complete in {time.time() - start:.1f}s: "
+          f"{len(rendered)} rendered, {len(skipped)} skipped, {len(failed)} failed.")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import pandas as pd
+import plotly.express as px
+
+# Aggregates found in EDS (Double safety, though ETL handles this)
+AGGREGATES = [
+    'All Countries', 'EU27', 'EU27 + UK',
+    'Recovery and Resilience Facility', 'United Kingdom (excl. NI)'
+]
+
+CORRELATION_COLUMNS = ['Coal', 'carbon_deficit', 'verified_emissions']
+LEDGER_COLUMNS = ['year', 'country', 'carbon_deficit', 'verified_emissions', 'allocated_allowances', 'Coal', 'Wind']
+NUMERIC_LEDGER_COLUMNS = ['carbon_deficit', 'verified_emissions', 'allocated_allowances', 'Coal', 'Wind']
+
+
+def format_large_number(num):
+    """
+    Formats large numbers into human-readable strings (B, M, k).
+    Examples:
+        1,500,000 -> 1.5 M
+        573,172,582 -> 573.2 M
+        -25,000 -> -25.0 k
+    """
+    if pd.isna(num):
+        return "0"
+
+    magnitude = 0
+    abs_num = abs(num)
+
+    while abs_num >= 1000:
+        magnitude += 1
+        abs_num /= 1000.0
+
+    # Choose suffix
+    suffix = ['', 'k', 'M', 'B', 'T'][magnitude]
+
+    # Format: 1 decimal place if M/B, otherwise 0
+    if magnitude >= 2: # Millions or Billions
+        return f'{num / (1000**magnitude):.1f} {suffix}'
+    elif magnitude == 1: # Thousands
+        return f'{num / (1000**magnitude):.0f} {suffix}'
+    else:
+        return f'{num:.0f}'
+
+
+def safe_sum(dataframe, col_name):
+    return dataframe[col_name].sum() if col_name in dataframe.columns else 0
+
+
+def filter_view(df, year, sector):
+    """Slice the market dataset down to the country rows shown for one (year, sector) view."""
+    df_filtered = df[(df['year'] == year) & (df['main_activity_sector_name'] == sector)].copy()
+
+    if 'country' in df_filtered.columns:
+        return df_filtered[~df_filtered['country'].isin(AGGREGATES)].copy()
+    return df_filtered
+
+
+def compute_kpis(df_countries):
+    total_deficit = safe_sum(df_countries, 'carbon_deficit')
+    total_coal = safe_sum(df_countries, 'Coal')
+
+    # Logic for Delta Colors
+    if total_deficit > 0:
+        delta_text = "Market Shortage (Buy)"
+        delta_color = "inverse" # Red in Streamlit
+    else:
+        delta_text = "Market Surplus (Sell)"
+        delta_color = "normal"  # Green in Streamlit
+
+    return {
+        'total_deficit': total_deficit,
+        'total_coal': total_coal,
+        'formatted_deficit': format_large_number(total_deficit),
+        'formatted_coal': format_large_number(total_coal),
+        'delta_text': delta_text,
+        'delta_color': delta_color,
+    }
+
+
+def build_top_deficits_chart(df_countries):
+    if df_countries.empty or 'carbon_deficit' not in df_countries.columns:
+        return None
+
+    # Show top 10 buyers (Deficit > 0)
+    top_deficits = df_countries.sort_values(by='carbon_deficit', ascending=False).head(10)
+
+    fig_bar = px.bar(
+        top_deficits,
+        x='country',
+        y='carbon_deficit',
+        color='carbon_deficit',
+        color_continuous_scale='Reds',
+        title="Largest Buyers of EUAs (Carbon Credits)",
+        labels={'carbon_deficit': 'Deficit (tCO2)', 'country': 'Country'}
+    )
+    # Update bar chart layout for readability
+    fig_bar.update_layout(xaxis_title=None)
+    return fig_bar
+
+
+def has_correlation_data(df_countries):
+    return all(col in df_countries.columns for col in CORRELATION_COLUMNS)
+
+
+def build_correlation_chart(df_countries, sector):
+    if not has_correlation_data(df_countries):
+        return None
+
+    # Filter for meaningful visualization (remove 0 coal if checking correlation)
+    df_chart = df_countries.dropna(subset=['Coal', 'carbon_deficit'])
+    if df_chart.empty:
+        return None
+
+    return px.scatter(
+        df_chart,
+        x='Coal',
+        y='carbon_deficit',
+        size='verified_emissions',
+        color='country',
+        title=f"Correlation: Grid Coal Power vs. {sector} Deficit",
+        labels={
+            'Coal': 'Grid Coal Generation (TWh)',
+            'carbon_deficit': 'Sector Carbon Deficit',
+            'verified_emissions': 'Emission Volume'
+        },
+        trendline="ols" if len(df_chart) > 2 else None # Only trendline if enough points
+    )
+
+
+def build_ledger(df_countries):
+    """Returns the ledger frame (sorted by deficit) and its column format dict."""
+    display_cols = [c for c in LEDGER_COLUMNS if c in df_countries.columns]
+
+    # Secure Formatting: prevent crashes on text columns
+    format_dict = {col: "{:,.0f}" for col in NUMERIC_LEDGER_COLUMNS if col in df_countries.columns}
+
+    ledger = df_countries[display_cols]
+    if 'carbon_deficit' in ledger.columns:
+        ledger = ledger.sort_values(by='carbon_deficit', ascending=False)
+    return ledger, format_dict
@@ -0,0 +1,312 @@
+import hashlib
+import html
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+from src.dashboard_views import (
+    filter_view, compute_kpis, build_top_deficits_chart,
+    build_correlation_chart, build_ledger
+)
+
+SUPPORTED_FORMATS = ('html', 'png', 'pdf')
+
+# Bump when the rendered layout changes so cached views are re-rendered
+RENDER_VERSION = "2"
+
+
+def output_path(view_dir, fmt):
+    return os.path.join(view_dir, f'report.{fmt}')
+
+
+def hash_path(view_dir, fmt):
+    """Each output keeps its own digest, so one format going stale never hides behind another."""
+    return output_path(view_dir, fmt) + '.hash'
+
+
+def slugify(value):
+    return re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-') or 'view'
+
+
+def slice_hash(df_countries, year, sector):
+    """Fingerprint of everything a view is rendered from: its data slice plus the render layout version."""
+    digest = hashlib.sha256()
+    digest.update(f"{RENDER_VERSION}|{year}|{sector}|".encode('utf-8'))
+    digest.update(df_countries.sort_index(axis=1).to_csv(index=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _build_html_page(year, sector, df_countries, kpis, fig_bar, fig_scatter):
+    sections = []
+    plotly_js = 'cdn'  # Load plotly.js once, from the first chart on the page
+    for fig, empty_msg in (
+        (fig_bar, "No data available for charts."),
+        (fig_scatter, "Physical grid data not available for this view."),
+    ):
+        if fig is None:
+            sections.append(f"<p><em>{empty_msg}</em></p>")
+        else:
+            sections.append(fig.to_html(full_html=False, include_plotlyjs=plotly_js))
+            plotly_js = False
+
+    if df_countries.empty:
+        ledger_html = "<p>No data to display.</p>"
+    else:
+        ledger, format_dict = build_ledger(df_countries)
+        ledger_html = ledger.style.format(format_dict).hide(axis='index').to_html()
+
+    provisional = ""
+    if year >= 2024:
+        provisional = (f"<p class='note'>ℹ️ NOTE: Data for {year} includes PROVISIONAL estimates "
+                       f"based on EU Phase 4 reduction schedules.</p>")
+
+    title = html.escape(f"EU Carbon Market Analysis ({year}) - {sector}")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+.kpis {{ display: flex; gap: 3em; }}
+.kpi .value {{ font-size: 1.8em; font-weight: bold; }}
+.charts {{ display: flex; flex-wrap: wrap; }}
+.charts > div, .charts > p {{ flex: 1 1 45%; }}
+table {{ border-collapse: collapse; }}
+td, th {{ padding: 4px 10px; text-align: right; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<h1>⚡ {title}</h1>
+{provisional}
+<div class="kpis">
+  <div class="kpi"><div>Net Carbon Position</div><div class="value">{kpis['formatted_deficit']} tCO2</div><div>{kpis['delta_text']}</div></div>
+  <div class="kpi"><div>Total Coal Gen (Grid)</div><div class="value">{kpis['formatted_coal']} TWh</div><div>Physical Load</div></div>
+  <div class="kpi"><div>Selected Sector</div><div class="value">{html.escape(str(sector))}</div></div>
+</div>
+<div class="charts">
+{''.join(sections)}
+</div>
+<h2>📄 Detailed Ledger</h2>
+{ledger_html}
+</body>
+</html>
+"""
+
+
+def _build_report_figure(year, sector, df_countries, kpis, fig_bar, fig_scatter):
+    """Single-page figure (KPIs, both charts, ledger) for static image/PDF output."""
+    page = make_subplots(
+        rows=3, cols=2,
+        specs=[
+            [None, None],  # KPI band, filled with annotations below
+            [{'type': 'xy'}, {'type': 'xy'}],
+            [{'type': 'table', 'colspan': 2}, None],
+        ],
+        row_heights=[0.12, 0.48, 0.40],
+        vertical_spacing=0.08,
+        subplot_titles=(
+            "Largest Buyers of EUAs (Carbon Credits)", f"Correlation: Grid Coal Power vs. {sector} Deficit",
+            None,
+        ),
+    )
+    bar_y = page.layout.yaxis.domain
+    scatter_x, scatter_y = page.layout.xaxis2.domain, page.layout.yaxis2.domain
+
+    # Same human-readable KPI values as the dashboard and the HTML report
+    kpi_y = (bar_y[1] + 0.08 + 1) / 2
+    for x, label, value, note in (
+        (1 / 6, "Net Carbon Position", f"{kpis['formatted_deficit']} tCO2", kpis['delta_text']),
+        (1 / 2, "Total Coal Gen (Grid)", f"{kpis['formatted_coal']} TWh", "Physical Load"),
+        (5 / 6, "Selected Sector", html.escape(str(sector)), ""),
+    ):
+        page.add_annotation(
+            x=x, y=kpi_y, xref='paper', yref='paper', showarrow=False,
+            text=f"{label}<br><b style='font-size:26px'>{value}</b><br>{note}",
+        )
+
+    if fig_bar is not None:
+        for trace in fig_bar.data:
+            page.add_trace(trace, row=2, col=1)
+        # Bar heights already carry the deficit; a page-height colorbar would collide with the legend
+        page.update_layout(coloraxis=fig_bar.layout.coloraxis, coloraxis_showscale=False)
+        page.update_yaxes(title_text='Deficit (tCO2)', row=2, col=1)
+    if fig_scatter is not None:
+        for trace in fig_scatter.data:
+            page.add_trace(trace, row=2, col=2)
+        page.update_xaxes(title_text='Grid Coal Generation (TWh)', row=2, col=2)
+        page.update_yaxes(title_text='Sector Carbon Deficit', row=2, col=2)
+        page.update_layout(legend={
+            'x': scatter_x[1] + 0.01, 'xanchor': 'left',
+            'y': scatter_y[1], 'yanchor': 'top',
+        })
+
+    if not df_countries.empty:
+        ledger, format_dict = build_ledger(df_countries)
+        cells = [
+            ledger[col].map(lambda v, fmt=format_dict.get(col): fmt.format(v) if fmt and pd.notna(v) else v)
+            for col in ledger.columns
+        ]
+        page.add_trace(go.Table(
+            header={'values': list(ledger.columns)},
+            cells={'values': cells},
+        ), row=3, col=1)
+
+    page.update_layout(
+        title_text=f"⚡ EU Carbon Market Analysis ({year}) - {sector}",
+        width=1400, height=1600,
+    )
+    return page
+
+
+def _write_outputs(view_dir, formats, digest, write):
+    # Drop the old digests first: a failed render must not leave the previous files looking current
+    for fmt in formats:
+        if os.path.exists(hash_path(view_dir, fmt)):
+            os.remove(hash_path(view_dir, fmt))
+    write([output_path(view_dir, fmt) for fmt in formats])
+    for fmt in formats:
+        with open(hash_path(view_dir, fmt), 'w') as f:
+            f.write(digest)
+
+
+def render_view(job):
+    """
+    Renders one (year, sector) view to the given (stale) formats.
+    Runs inside a worker process, so it only receives picklable plain data.
+    """
+    year, sector, df_countries, view_dir, formats, digest = job
+    os.makedirs(view_dir, exist_ok=True)
+
+    kpis = compute_kpis(df_countries)
+    fig_bar = build_top_deficits_chart(df_countries)
+    fig_scatter = build_correlation_chart(df_countries, sector)
+
+    if 'html' in formats:
+        page_html = _build_html_page(year, sector, df_countries, kpis, fig_bar, fig_scatter)
+
+        def write_html(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(page_html)
+
+        _write_outputs(view_dir, ['html'], digest, lambda paths: write_html(paths[0]))
+
+    static_formats = [fmt for fmt in formats if fmt != 'html']
+    if static_formats:
+        page = _build_report_figure(year, sector, df_countries, kpis, fig_bar, fig_scatter)
+        # One kaleido (Chrome) session for all static formats; without explicit sizes it falls back to 700x500
+        _write_outputs(view_dir, static_formats, digest, lambda paths: pio.write_images(
+            page, paths, format=static_formats, width=page.layout.width, height=page.layout.height,
+        ))
+
+    return year, sector
+
+
+class DashboardReportExporter:
+    def __init__(self, input_path, output_dir, formats=('html',), max_workers=None):
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.max_workers = max_workers
+
+        unknown = [fmt for fmt in self.formats if fmt not in SUPPORTED_FORMATS]
+        if unknown:
+            raise ValueError(f"❌ Unsupported report format(s): {unknown}. Choose from {SUPPORTED_FORMATS}")
+
+    def load(self):
+        if not os.path.exists(self.input_path):
+            raise FileNotFoundError(f"❌ File not found at {self.input_path}. Run 'main.py' first.")
+        return pd.read_csv(self.input_path)
+
+    def view_dir(self, year, sector):
+        return os.path.join(self.output_dir, str(year), slugify(sector))
+
+    def is_up_to_date(self, view_dir, fmt, digest):
+        if not os.path.exists(output_path(view_dir, fmt)) or not os.path.exists(hash_path(view_dir, fmt)):
+            return False
+        with open(hash_path(view_dir, fmt)) as f:
+            return f.read().strip() == digest
+
+    def plan_views(self, df, years=None, sectors=None, force=False):
+        """Returns (jobs to render, views skipped as unchanged). Jobs only carry their stale formats."""
+        all_years = sorted(df['year'].unique(), reverse=True)
+        all_sectors = sorted(df['main_activity_sector_name'].unique())
+
+        unknown_years = [y for y in (years or []) if y not in all_years]
+        unknown_sectors = [s for s in (sectors or []) if s not in all_sectors]
+        if unknown_years or unknown_sectors:
+            raise ValueError(
+                f"❌ Not in {self.input_path}: years {unknown_years}, sectors {unknown_sectors}. "
+                f"Available sectors: {all_sectors}"
+            )
+
+        selected_years = [y for y in all_years if years is None or y in years]
+        selected_sectors = [s for s in all_sectors if sectors is None or s in sectors]
+
+        jobs, skipped = [], []
+        for year in map(int, selected_years):
+            for sector in selected_sectors:
+                df_countries = filter_view(df, year, sector)
+                if df_countries.empty:
+                    continue
+
+                view_dir = self.view_dir(year, sector)
+                digest = slice_hash(df_countries, year, sector)
+                stale = tuple(fmt for fmt in self.formats
+                              if force or not self.is_up_to_date(view_dir, fmt, digest))
+                if not stale:
+                    skipped.append((year, sector))
+                    continue
+                jobs.append((year, sector, df_countries, view_dir, stale, digest))
+        return jobs, skipped
+
+    def export(self, years=None, sectors=None, force=False):
+        df = self.load()
+        jobs, skipped = self.plan_views(df, years, sectors, force)
+        print(f"📋 {len(jobs)} view(s) to render, {len(skipped)} unchanged view(s) skipped.")
+
+        rendered, failed = [], []
+        if jobs:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(render_view, job): job[:2] for job in jobs}
+                for future in as_completed(futures):
+                    year, sector = futures[future]
+                    try:
+                        future.result()
+                        rendered.append((year, sector))
+                        print(f"   ✅ {year} | {sector}")
+                    except Exception as e:
+                        failed.append((year, sector))
+                        print(f"   ❌ {year} | {sector}: {e}")
+
+        self.write_index(df)
+
+        return rendered, skipped, failed
+
+    def write_index(self, df):
+        """Links every exported view on disk, not just the ones rendered in this run."""
+        pairs = df[['year', 'main_activity_sector_name']].drop_duplicates()
+        rows = []
+        for year, sector in sorted(pairs.itertuples(index=False), key=lambda v: (-v[0], v[1])):
+            view_dir = self.view_dir(year, sector)
+            available = [fmt for fmt in SUPPORTED_FORMATS if os.path.exists(output_path(view_dir, fmt))]
+            if not available:
+                continue
+            rel_dir = os.path.relpath(view_dir, self.output_dir).replace(os.sep, '/')
+            links = " ".join(f"<a href='{rel_dir}/report.{fmt}'>{fmt.upper()}</a>" for fmt in available)
+            rows.append(f"<tr><td>{year}</td><td>{html.escape(str(sector))}</td><td>{links}</td></tr>")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(
+                "<!DOCTYPE html>\n<html>\n<head><meta charset='utf-8'><title>EU Carbon Desk Reports</title></head>\n"
+                "<body>\n<h1>⚡ EU Carbon Market Reports</h1>\n"
+                "<table>\n<tr><th>Year</th><th>Sector</th><th>Reports</th></tr>\n"
+                + "\n".join(rows)
+                + "\n</table>\n</body>\n</html>\n"
+            )
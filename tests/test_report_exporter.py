@@ -0,0 +1,137 @@
+import os
+
+import pandas as pd
+import pytest
+
+import src.report_exporter as report_exporter
+from src.dashboard_views import filter_view, compute_kpis, build_top_deficits_chart, build_correlation_chart
+from src.report_exporter import DashboardReportExporter, hash_path, output_path, slice_hash
+
+
+def write_market_csv(path, deficit=1_000_000):
+    rows = [
+        {'year': year, 'country': country, 'main_activity_sector_name': 'Refineries',
+         'carbon_deficit': deficit, 'verified_emissions': 2_000_000, 'allocated_allowances': 1_000_000,
+         'Coal': coal, 'Wind': 5.0}
+        for year in (2023, 2024)
+        for country, coal in (('Germany', 100.0), ('Poland', 80.0), ('Czechia', 40.0))
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def fake_static_output(exporter, year, sector, fmt):
+    """Stand-in for a kaleido render, so the cache logic can be tested without Chrome."""
+    df = exporter.load()
+    view_dir = exporter.view_dir(year, sector)
+    with open(output_path(view_dir, fmt), 'w') as f:
+        f.write('stale render')
+    with open(hash_path(view_dir, fmt), 'w') as f:
+        f.write(slice_hash(filter_view(df, year, sector), year, sector))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'market.csv'
+    write_market_csv(path)
+    return str(path)
+
+
+def test_unchanged_views_are_skipped(csv_path, tmp_path):
+    exporter = DashboardReportExporter(csv_path, str(tmp_path / 'reports'), ['html'], max_workers=1)
+
+    rendered, skipped, failed = exporter.export()
+    assert sorted(rendered) == [(2023, 'Refineries'), (2024, 'Refineries')]
+    assert not skipped and not failed
+
+    rendered, skipped, failed = exporter.export()
+    assert not rendered
+    assert sorted(skipped) == [(2023, 'Refineries'), (2024, 'Refineries')]
+    assert all(type(year) is int for year, _ in skipped)
+
+
+def test_each_format_tracks_its_own_input(csv_path, tmp_path):
+    reports = str(tmp_path / 'reports')
+    DashboardReportExporter(csv_path, reports, ['html'], max_workers=1).export()
+    both = DashboardReportExporter(csv_path, reports, ['html', 'pdf'], max_workers=1)
+    fake_static_output(both, 2023, 'Refineries', 'pdf')
+    fake_static_output(both, 2024, 'Refineries', 'pdf')
+
+    jobs, skipped = both.plan_views(both.load())
+    assert not jobs and len(skipped) == 2
+
+    # Data changes, but only the HTML is refreshed: the PDF must still be seen as stale
+    write_market_csv(csv_path, deficit=5_000_000)
+    DashboardReportExporter(csv_path, reports, ['html'], max_workers=1).export()
+
+    jobs, skipped = both.plan_views(both.load())
+    assert not skipped
+    assert sorted((year, formats) for year, _, _, _, formats, _ in jobs) == [(2023, ('pdf',)), (2024, ('pdf',))]
+
+
+def test_index_only_links_existing_outputs(csv_path, tmp_path):
+    reports = tmp_path / 'reports'
+    exporter = DashboardReportExporter(csv_path, str(reports), ['html'], max_workers=1)
+    exporter.export()
+    fake_static_output(exporter, 2024, 'Refineries', 'pdf')
+    exporter.export()
+
+    index = (reports / 'index.html').read_text(encoding='utf-8')
+    assert "2024/refineries/report.pdf" in index
+    assert "2023/refineries/report.html" in index
+    assert "2023/refineries/report.pdf" not in index
+
+
+def test_unknown_years_and_sectors_are_rejected(csv_path, tmp_path):
+    exporter = DashboardReportExporter(csv_path, str(tmp_path / 'reports'), ['html'], max_workers=1)
+
+    with pytest.raises(ValueError, match="Combustion of fuel"):
+        exporter.export(sectors=['Combustion of fuel'])
+    with pytest.raises(ValueError, match="1999"):
+        exporter.export(years=[1999])
+
+
+def test_report_figure_layout(csv_path):
+    df = pd.read_csv(csv_path)
+    df_countries = filter_view(df, 2024, 'Refineries')
+    page = report_exporter._build_report_figure(
+        2024, 'Refineries', df_countries, compute_kpis(df_countries),
+        build_top_deficits_chart(df_countries), build_correlation_chart(df_countries, 'Refineries'),
+    )
+
+    bars = [t for t in page.data if t.type == 'bar']
+    scatters = [t for t in page.data if t.type == 'scatter']
+    assert bars and all((t.xaxis, t.yaxis) == ('x', 'y') for t in bars)
+    assert scatters and all((t.xaxis, t.yaxis) == ('x2', 'y2') for t in scatters)
+    assert any(t.mode == 'lines' for t in scatters)  # OLS trendline with 3+ countries
+    assert page.layout.yaxis.title.text == 'Deficit (tCO2)'
+    assert 'Refineries' in page.layout.annotations[1].text
+
+    table = next(t for t in page.data if t.type == 'table')
+    columns = dict(zip(table.header.values, table.cells.values))
+    assert list(columns['country']) == ['Germany', 'Poland', 'Czechia']
+    assert list(columns['carbon_deficit']) == ['1,000,000'] * 3
+
+    kpi_text = " ".join(a.text for a in page.layout.annotations)
+    assert "3.0 M tCO2" in kpi_text and "220 TWh" in kpi_text
+
+    # Legend sits beside the scatter and no page-height colorbar competes with it
+    assert page.layout.coloraxis.showscale is False
+    assert page.layout.legend.x >= page.layout.xaxis2.domain[1]
+    assert page.layout.yaxis2.domain[0] <= page.layout.legend.y <= page.layout.yaxis2.domain[1]
+
+
+def test_failed_static_render_is_not_cached(csv_path, tmp_path, monkeypatch):
+    def broken_write_images(*args, **kwargs):
+        raise RuntimeError("no Chrome")
+
+    # Workers are forked, so the patch carries over into the pool
+    monkeypatch.setattr(report_exporter.pio, 'write_images', broken_write_images)
+    exporter = DashboardReportExporter(csv_path, str(tmp_path / 'reports'), ['html', 'pdf'], max_workers=1)
+
+    rendered, skipped, failed = exporter.export()
+    assert not rendered and not skipped
+    assert sorted(failed) == [(2023, 'Refineries'), (2024, 'Refineries')]
+
+    view_dir = exporter.view_dir(2024, 'Refineries')
+    assert os.path.exists(hash_path(view_dir, 'html'))
+    assert not os.path.exists(hash_path(view_dir, 'pdf'))